@@ -37,14 +37,15 @@ ContinuousWaveletTransform Analyzer.
 
 """
 
+import math
 import uuid
 
 import numpy
+import psutil
 from tvb.adapters.datatypes.db.spectral import WaveletCoefficientsIndex
 from tvb.adapters.datatypes.db.time_series import TimeSeriesIndex
 from tvb.adapters.datatypes.h5.spectral_h5 import WaveletCoefficientsH5
 from tvb.adapters.datatypes.h5.time_series_h5 import TimeSeriesH5
-from tvb.analyzers.wavelet import compute_continuous_wavelet_transform
 from tvb.basic.neotraits.api import Attr, Range, Float
 from tvb.core.adapters.abcadapter import ABCAdapterForm, ABCAdapter
 from tvb.core.entities.filters.chain import FilterChain
@@ -52,6 +53,7 @@ from tvb.core.neocom import h5
 from tvb.core.neotraits.forms import FormField, Form, TraitDataTypeSelectField, StrField, FloatField
 from tvb.core.neotraits.view_model import ViewModel, DataTypeGidAttr
 from tvb.datatypes.time_series import TimeSeries
+from tvb.simulator.backend.ref import ReferenceBackend
 
 
 class WaveletAdapterModel(ViewModel):
@@ -155,6 +157,10 @@ class ContinuousWaveletTransformAdapter(ABCAdapter):
     _ui_description = "Compute Wavelet Tranformation for a TimeSeries input DataType."
     _ui_subsection = "wavelet"
 
+    def __init__(self):
+        super(ContinuousWaveletTransformAdapter, self).__init__()
+        self.memory_factor = 1
+
     def get_form_class(self):
         return ContinuousWaveletTransformAdapterForm
 
@@ -182,14 +188,27 @@ class ContinuousWaveletTransformAdapter(ABCAdapter):
         """
         Return the required memory to run this algorithm.
         """
-        used_shape = (self.input_shape[0],
-                      self.input_shape[1],
-                      1,
-                      self.input_shape[3])
-        input_size = numpy.prod(used_shape) * 8.0
+        # Imported here, so that listing adapters does not load the analyzer (and probe for CuPy/CUDA)
+        from tvb.analyzers.wavelet import check_frequencies, padded_fft_length, TILE_BYTES
+
+        sample_rate = TimeSeries(sample_period=self.input_time_series_index.sample_period,
+                                 sample_period_unit=self.input_time_series_index.sample_period_unit).sample_rate
+        _, freqs = check_frequencies(view_model.frequencies)
+        nfft = padded_fft_length(self.input_shape[0], freqs, view_model.q_ratio, sample_rate)
+
+        # Allocated once for all blocks: the spectra of the kernels (complex), and the product of one tile
+        fixed_size = len(freqs) * nfft * 16 + TILE_BYTES
+        # Split over the blocks of nodes: the input block, its zero padded spectrum (complex) and the coefficients
+        nr_channels = math.prod(self.input_shape[1:])
+        input_size = self.input_shape[0] * nr_channels * 8 + nfft * nr_channels * 16
         output_size = self.result_size(view_model.frequencies, view_model.sample_period,
-                                       used_shape, self.input_time_series_index.sample_period)
-        return input_size + output_size
+                                       self.input_shape, self.input_time_series_index.sample_period)
+        total_free_memory = psutil.virtual_memory().free + psutil.swap_memory().free
+        blocks_memory = input_size + output_size
+        while (fixed_size + blocks_memory / self.memory_factor) / total_free_memory > 0.8 \
+                and self.memory_factor < self.input_shape[2]:
+            self.memory_factor += 1
+        return fixed_size + blocks_memory / self.memory_factor
 
     def get_required_disk_size(self, view_model):
         """
@@ -209,6 +228,8 @@ class ContinuousWaveletTransformAdapter(ABCAdapter):
         :param view_model: the ViewModel keeping the algorithm inputs
         :return: the wavelet coefficients for the specified time series
         """
+        from tvb.analyzers.wavelet import compute_continuous_wavelet_transform, build_kernels
+
         frequencies_array = numpy.array([])
         if view_model.frequencies is not None:
             frequencies_array = view_model.frequencies.to_array()
@@ -223,18 +244,23 @@ class ContinuousWaveletTransformAdapter(ABCAdapter):
 
         # ------------- NOTE: Assumes 4D, Simulator timeSeries. --------------##
         node_slice = [slice(self.input_shape[0]), slice(self.input_shape[1]), None, slice(self.input_shape[3])]
+        block_size = int(math.floor(self.input_shape[2] / self.memory_factor))
+        blocks = int(math.ceil(self.input_shape[2] / block_size))
 
-        # ---------- Iterate over slices and compose final result ------------##
+        # ---------- Iterate over blocks of nodes and compose final result ------------##
         small_ts = TimeSeries()
         small_ts.sample_period = time_series_h5.sample_period.load()
         small_ts.sample_period_unit = time_series_h5.sample_period_unit.load()
-        for node in range(self.input_shape[2]):
-            node_slice[2] = slice(node, node + 1)
+        # The wavelet kernels are the same for all blocks, build them only once
+        kernels = build_kernels(small_ts, self.input_shape[0], view_model.frequencies, view_model.sample_period,
+                                view_model.q_ratio, view_model.normalisation, view_model.mother)
+        for block in range(blocks):
+            node_slice[2] = slice(block * block_size, min([(block + 1) * block_size, self.input_shape[2]]), 1)
             small_ts.data = time_series_h5.read_data_slice(tuple(node_slice))
             partial_wavelet = compute_continuous_wavelet_transform(small_ts, view_model.frequencies,
                                                                    view_model.sample_period,
                                                                    view_model.q_ratio, view_model.normalisation,
-                                                                   view_model.mother)
+                                                                   view_model.mother, kernels)
             wavelet_h5.write_data_slice(partial_wavelet)
 
         time_series_h5.close()
@@ -257,9 +283,11 @@ class ContinuousWaveletTransformAdapter(ABCAdapter):
         Returns the shape of the main result (complex array) of the continuous
         wavelet transform.
         """
-        freq_len = int((frequencies.hi - frequencies.lo) / frequencies.step)
-        temporal_step = max((1, sample_period / input_sample_period))
-        nt = int(round(input_shape[0] / temporal_step))
+        lo, hi, step = frequencies.lo, frequencies.hi, frequencies.step
+        freq_len = int((hi - lo) / step)
+        # Same integer down sampling step, and number of kept time points, as the analyzer uses
+        temporal_step = max(1, ReferenceBackend.iround(sample_period / input_sample_period))
+        nt = (input_shape[0] + temporal_step - 1) // temporal_step
         result_shape = (freq_len, nt,) + input_shape[1:]
         return result_shape
 
@@ -268,7 +296,7 @@ class ContinuousWaveletTransformAdapter(ABCAdapter):
         Returns the storage size in Bytes of the main result (complex array) of
         the continuous wavelet transform.
         """
-        result_size = numpy.prod(
+        result_size = math.prod(
             self.result_shape(frequencies, sample_period, input_shape,
-                              input_sample_period)) * 2.0 * 8.0  # complex*Bytes
+                              input_sample_period)) * 2 * 8  # complex*Bytes
         return result_size
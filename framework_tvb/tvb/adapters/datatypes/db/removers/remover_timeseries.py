@@ -46,43 +46,26 @@ class TimeseriesRemover(ABCRemover):
         Called when a TimeSeries is removed.
         """
         if not skip_validation:
-            key = 'fk_source_gid'
+            associated_types = [(FcdIndex, "FCD"),
+                                (CovarianceIndex, "Covariance"),
+                                (PrincipalComponentsIndex, "PrincipalComponents"),
+                                (IndependentComponentsIndex, "IndependentComponents"),
+                                (CrossCorrelationIndex, "CrossCorrelation"),
+                                (FourierSpectrumIndex, "FourierSpectrum"),
+                                (WaveletCoefficientsIndex, "WaveletCoefficients"),
+                                (CoherenceSpectrumIndex, "CoherenceSpectrum"),
+                                (CorrelationCoefficientsIndex, "CorrelationCoefficient"),
+                                (DatatypeMeasureIndex, "DatatypeMeasure"),
+                                (ComplexCoherenceSpectrumIndex, "ComplexCoherenceSpectrum")]
 
-            associated_fcd = dao.get_generic_entity(FcdIndex, self.handled_datatype.gid, key)
-            associated_cv = dao.get_generic_entity(CovarianceIndex, self.handled_datatype.gid, key)
-            associated_pca = dao.get_generic_entity(PrincipalComponentsIndex, self.handled_datatype.gid, key)
-            associated_is = dao.get_generic_entity(IndependentComponentsIndex, self.handled_datatype.gid, key)
-            associated_cc = dao.get_generic_entity(CrossCorrelationIndex, self.handled_datatype.gid, key)
-            associated_fr = dao.get_generic_entity(FourierSpectrumIndex, self.handled_datatype.gid, key)
-            associated_wv = dao.get_generic_entity(WaveletCoefficientsIndex, self.handled_datatype.gid, key)
-            associated_cs = dao.get_generic_entity(CoherenceSpectrumIndex, self.handled_datatype.gid, key)
-            associated_coef = dao.get_generic_entity(CorrelationCoefficientsIndex, self.handled_datatype.gid, key)
-            associated_dtm = dao.get_generic_entity(DatatypeMeasureIndex, self.handled_datatype.gid, key)
-            associated_ccs = dao.get_generic_entity(ComplexCoherenceSpectrumIndex, self.handled_datatype.gid, key)
+            # One query for all the associated tables, instead of one query per table
+            associated = dao.get_associated_entities_existence([entity_type for entity_type, _ in associated_types],
+                                                               self.handled_datatype.gid, 'fk_source_gid')
 
             msg = "TimeSeries cannot be removed as it is used by at least one "
 
-            if len(associated_fcd) > 0:
-                raise RemoveDataTypeException(msg + " FCD.")
-            if len(associated_cv) > 0:
-                raise RemoveDataTypeException(msg + " Covariance.")
-            if len(associated_pca) > 0:
-                raise RemoveDataTypeException(msg + " PrincipalComponents.")
-            if len(associated_is) > 0:
-                raise RemoveDataTypeException(msg + " IndependentComponents.")
-            if len(associated_cc) > 0:
-                raise RemoveDataTypeException(msg + " CrossCorrelation.")
-            if len(associated_fr) > 0:
-                raise RemoveDataTypeException(msg + " FourierSpectrum.")
-            if len(associated_wv) > 0:
-                raise RemoveDataTypeException(msg + " WaveletCoefficients.")
-            if len(associated_cs) > 0:
-                raise RemoveDataTypeException(msg + " CoherenceSpectrum.")
-            if len(associated_coef) > 0:
-                raise RemoveDataTypeException(msg + " CorrelationCoefficient.")
-            if len(associated_dtm) > 0:
-                raise RemoveDataTypeException(msg + " DatatypeMeasure.")
-            if len(associated_ccs) > 0:
-                raise RemoveDataTypeException(msg + " ComplexCoherenceSpectrum.")
+            for entity_type, label in associated_types:
+                if associated[entity_type]:
+                    raise RemoveDataTypeException(msg + " " + label + ".")
 
         ABCRemover.remove_datatype(self, skip_validation)
@@ -33,6 +33,9 @@ import numpy
 from tvb.core.neotraits.h5 import H5File, DataSet, Scalar, Reference, Enum
 from tvb.datatypes.spectral import FourierSpectrum, WaveletCoefficients, CoherenceSpectrum, ComplexCoherenceSpectrum
 
+# Upper bound for one read of the wavelet power dataset, when summing it over nodes
+READ_CHUNK_BYTES = 16 * 1024 ** 2
+
 
 class DataTypeMatrixH5(H5File):
     def get_min_max_values(self):
@@ -111,16 +114,18 @@ class WaveletCoefficientsH5(DataTypeMatrixH5):
 
     def __init__(self, path):
         super(WaveletCoefficientsH5, self).__init__(path)
-        self.array_data = DataSet(WaveletCoefficients.array_data, self, expand_dimension=2)
+        # One node per chunk for the node-expanded datasets, so that the blocks of nodes written by the analyzer
+        # and read by the viewers are whole chunks; the storage splits the other dimensions to bound their size
+        self.array_data = DataSet(WaveletCoefficients.array_data, self, expand_dimension=3, chunk_expand_size=1)
         self.source = Reference(WaveletCoefficients.source, self)
         self.mother = Scalar(WaveletCoefficients.mother, self)
         self.sample_period = Scalar(WaveletCoefficients.sample_period, self)
         self.frequencies = DataSet(WaveletCoefficients.frequencies, self)
         self.normalisation = Scalar(WaveletCoefficients.normalisation, self)
         self.q_ratio = Scalar(WaveletCoefficients.q_ratio, self)
-        self.amplitude = DataSet(WaveletCoefficients.amplitude, self, expand_dimension=2)
-        self.phase = DataSet(WaveletCoefficients.phase, self, expand_dimension=2)
-        self.power = DataSet(WaveletCoefficients.power, self, expand_dimension=2)
+        self.amplitude = DataSet(WaveletCoefficients.amplitude, self, expand_dimension=3, chunk_expand_size=1)
+        self.phase = DataSet(WaveletCoefficients.phase, self, expand_dimension=3, chunk_expand_size=1)
+        self.power = DataSet(WaveletCoefficients.power, self, expand_dimension=3, chunk_expand_size=1)
 
     def write_data_slice(self, partial_result):
         """
@@ -139,6 +144,26 @@ class WaveletCoefficientsH5(DataTypeMatrixH5):
         partial_result.compute_power()
         self.power.append(partial_result.power, close_file=False)
 
+    def get_summed_power(self, time_start=0, time_end=None):
+        """
+        Sum the power of the first state variable and mode over all nodes, a chunk of nodes at a time.
+        Returns a float32 (frequency, time) matrix, as required for display and binary transport.
+        """
+        shape = self.power.shape
+        time_start = int(time_start)
+        time_end = shape[1] if time_end is None else int(time_end)
+        nodes_per_chunk = max(1, int(READ_CHUNK_BYTES // (shape[0] * max(1, time_end - time_start) * 8)))
+
+        summed_power = numpy.zeros((shape[0], time_end - time_start))
+        for node in range(0, shape[3], nodes_per_chunk):
+            slices = (slice(shape[0]),
+                      slice(time_start, time_end),
+                      slice(0, 1, None),
+                      slice(node, min(node + nodes_per_chunk, shape[3]), None),
+                      slice(0, 1, None))
+            summed_power += self.power[slices].sum(axis=3)[:, :, 0, 0]
+        return summed_power.astype(numpy.float32)
+
 
 class CoherenceSpectrumH5(DataTypeMatrixH5):
 
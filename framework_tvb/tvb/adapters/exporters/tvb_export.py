@@ -55,7 +55,8 @@ class TVBExporter(ABCExporter):
     def export(self, data, project, public_key_path, password):
         """
         Exports data type:
-        1. If data is a normal data type, simply exports storage file (HDF format)
+        1. If data is a normal data type, simply exports storage file (HDF format). When the file needs no
+           changes for export (no burst reference to remove and no encryption), it is served from where it is stored
         2. If data is a DataTypeGroup creates a zip with all files for all data types
         """
         download_file_name = self._get_export_file_name(data)
@@ -69,6 +70,12 @@ class TVBExporter(ABCExporter):
             return download_file_name, zip_file, True
         else:
             data_path = h5.path_for_stored_index(data)
+            if password is None and 'parent_burst' not in self.storage_interface.get_storage_manager(
+                    data_path).get_metadata():
+                # There is nothing to strip or encrypt, so serve the stored file as it is, without a temporary copy
+                # (and do not mark it for deletion after download)
+                return None, data_path, False
+
             data_file = self.storage_interface.export_datatypes([data_path], data, download_file_name,
                                                                 public_key_path, password)
 
@@ -41,7 +41,7 @@ import json
 from tvb.adapters.datatypes.db.spectral import WaveletCoefficientsIndex
 from tvb.adapters.datatypes.db.time_series import TimeSeriesIndex
 from tvb.core.adapters.abcadapter import ABCAdapterForm
-from tvb.core.adapters.abcdisplayer import ABCDisplayer
+from tvb.core.adapters.abcdisplayer import ABCDisplayer, URLGenerator
 from tvb.core.neocom import h5
 from tvb.core.neotraits.forms import TraitDataTypeSelectField
 from tvb.core.neotraits.view_model import ViewModel, DataTypeGidAttr
@@ -104,18 +104,18 @@ class WaveletSpectrogramVisualizer(ABCDisplayer):
         # type: (WaveletSpectrogramVisualizerModel) -> dict
 
         with h5.h5_file_for_gid(view_model.input_data) as input_h5:
-            shape = input_h5.array_data.shape
+            shape = input_h5.power.shape
             input_sample_period = input_h5.sample_period.load()
             input_frequencies = input_h5.frequencies.load()
             ts_index = self.load_entity_by_gid(input_h5.source.load())
 
-            slices = (slice(shape[0]),
-                      slice(shape[1]),
-                      slice(0, 1, None),
-                      slice(0, shape[3], None),
-                      slice(0, 1, None))
-            data_matrix = input_h5.power[slices]
-            data_matrix = data_matrix.sum(axis=3)
+            # Only the window used for the color scale is read here; the whole matrix is fetched by the
+            # browser as a float32 binary array, instead of being embedded as text in the page
+            scale_range_start = max(1, int(0.25 * shape[1]))
+            scale_range_end = max(1, int(0.75 * shape[1]))
+            scale_window = input_h5.get_summed_power(scale_range_start, scale_range_end)
+            scale_min = float(scale_window.min())
+            scale_max = float(scale_window.max())
 
         assert isinstance(ts_index, TimeSeriesIndex)
 
@@ -129,18 +129,14 @@ class WaveletSpectrogramVisualizer(ABCDisplayer):
             freq_lo = 0
             freq_hi = 1
 
-        scale_range_start = max(1, int(0.25 * shape[1]))
-        scale_range_end = max(1, int(0.75 * shape[1]))
-        scale_min = data_matrix[:, scale_range_start:scale_range_end, :].min()
-        scale_max = data_matrix[:, scale_range_start:scale_range_end, :].max()
-        matrix_data = ABCDisplayer.dump_with_precision(data_matrix.flat)
-        matrix_shape = json.dumps(data_matrix.squeeze().shape)
+        matrix_url = URLGenerator.build_binary_datatype_attribute_url(view_model.input_data, 'get_summed_power')
+        matrix_shape = json.dumps(shape[:2])
 
         params = dict(canvasName="Wavelet Spectrogram for: " + ts_index.title,
                       xAxisName="Time (%s)" % str(ts_index.sample_period_unit),
                       yAxisName="Frequency (%s)" % str("kHz"),
                       title=self._ui_name,
-                      matrix_data=matrix_data,
+                      matrix_url=matrix_url,
                       matrix_shape=matrix_shape,
                       start_time=ts_index.start_time,
                       end_time=end_time,
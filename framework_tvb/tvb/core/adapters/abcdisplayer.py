@@ -43,7 +43,14 @@ from tvb.core.adapters.abcadapter import AdapterLaunchModeEnum, ABCAdapter
 from tvb.core.adapters.exceptions import LaunchException
 from tvb.core.neocom import h5
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 LOCK_CREATE_FIGURE = Lock()
+# Largest power of ten that float64 represents exactly
+MAX_EXACT_POWER_OF_TEN = 22
 
 
 class URLGenerator(object):
@@ -184,8 +191,44 @@ class ABCDisplayer(ABCAdapter, metaclass=ABCMeta):
         """
         Dump a list of numbers into a string, each at the specified precision.
         """
-        format_str = "%0." + str(precision) + "g"
-        return "[" + ",".join(format_str % s for s in xs) + "]"
+        values = numpy.asarray(xs, dtype=numpy.float64).ravel()
+        rounded = None
+        if orjson is not None and numpy.isfinite(values).all():
+            rounded = ABCDisplayer._round_significant(values, precision)
+        if rounded is not None:
+            # Rounded to the significant digits with numpy, let orjson serialize the whole buffer in C
+            return orjson.dumps(rounded, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+        # Convert to Python floats in one go and format them all with a single operation,
+        # instead of formatting numpy scalars one by one
+        values = values.tolist()
+        format_str = ",".join(["%0." + str(precision) + "g"] * len(values))
+        return "[" + format_str % tuple(values) + "]"
+
+    @staticmethod
+    def _round_significant(values, precision):
+        """
+        Round finite values to the given number of significant digits, to the same values as %g formatting gives.
+        Returns None when the values are too small (e.g. subnormal) or too large to be scaled by exact powers of ten.
+        """
+        magnitude = numpy.zeros(values.shape)
+        nonzero = values != 0
+        magnitude[nonzero] = numpy.floor(numpy.log10(numpy.abs(values[nonzero])))
+        # Scale by exact powers of ten only, so that the rounded values keep their short representation
+        digits = precision - 1 - magnitude
+        if values.size and numpy.abs(digits).max() > MAX_EXACT_POWER_OF_TEN:
+            return None
+        up = 10.0 ** numpy.maximum(digits, 0)
+        down = 10.0 ** numpy.maximum(-digits, 0)
+        scaled = values * up / down
+        rounded = numpy.round(scaled) * down / up
+        # The scaled product is rounded in binary, and may fall on the other side of a half than the exact value
+        # that %g rounds (e.g. 2.675 is stored as 2.67499...), so the values close to a tie are formatted with %g
+        near_tie = numpy.abs(scaled - numpy.floor(scaled) - 0.5) <= 1e-12 * (numpy.abs(scaled) + 1)
+        if near_tie.any():
+            format_str = "%0." + str(precision) + "g"
+            rounded[near_tie] = [float(format_str % value) for value in values[near_tie].tolist()]
+        return rounded
 
     @staticmethod
     def handle_infinite_values(data):
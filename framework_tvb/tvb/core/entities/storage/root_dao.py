@@ -35,6 +35,7 @@ Base DAO behavior.
 .. moduleauthor:: Lia Domide <lia.domide@codemart.ro>
 """
 import importlib
+from sqlalchemy import exists, literal, select, union_all
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.exc import NoResultFound
 from tvb.basic.logger.builder import get_logger
@@ -107,6 +108,21 @@ class RootDAO(object, metaclass=SESSION_META_CLASS):
         return result
 
 
+    def get_associated_entities_existence(self, entity_types, filter_value, select_field="fk_source_gid"):
+        """
+        Check, with a single query, if any entity of each type in entity_types has select_field = filter_value.
+        EXISTS is used per type, so that the DB stops at the first matching row, and no rows are transferred.
+        Return a dictionary entity_type -> bool, keeping the order of entity_types.
+        """
+        queries = [select([literal(idx).label('idx'),
+                           exists().where(getattr(entity_type, select_field) == filter_value).label('found')])
+                   for idx, entity_type in enumerate(entity_types)]
+        found = [False] * len(entity_types)
+        for idx, idx_found in self.session.execute(union_all(*queries)).fetchall():
+            found[idx] = bool(idx_found)
+        return dict(zip(entity_types, found))
+
+
     def remove_entity(self, entity_class, entity_id):
         """ 
         Find entity by Id and Type, end then remove it.
@@ -180,8 +180,8 @@ class DataSet(Accessor):
     A dataset in a h5 file that corresponds to a traited NArray.
     """
 
-    def __init__(self, trait_attribute, h5file, name=None, expand_dimension=-1):
-        # type: (NArray, H5File, str, int) -> None
+    def __init__(self, trait_attribute, h5file, name=None, expand_dimension=-1, chunk_expand_size=None):
+        # type: (NArray, H5File, str, int, int) -> None
         """
         :param trait_attribute: A traited attribute
         :param h5file: The parent H5file that contains this Accessor
@@ -190,9 +190,14 @@ class DataSet(Accessor):
                      If the traited attribute is not a member of a HasTraits then
                      it has no name and you have to provide this parameter
         :param expand_dimension: An int designating a dimension of the array that may grow.
+        :param chunk_expand_size: Optional, the size along expand_dimension of the HDF5 chunks of this dataset.
+                     Chunks then span all the other dimensions of the first appended slice, so that appending
+                     slices of a multiple of this size writes whole chunks only.
+                     By default the chunk shape is chosen by h5py.
         """
         super(DataSet, self).__init__(trait_attribute, h5file, name)
         self.expand_dimension = expand_dimension
+        self.chunk_expand_size = chunk_expand_size
         # Cache metadata for expandable DataSets to avoid multiple reads/writes at append time
         self.meta = None
 
@@ -208,7 +213,8 @@ class DataSet(Accessor):
             data,
             self.field_name,
             grow_dimension=grow_dimension,
-            close_file=close_file
+            close_file=close_file,
+            chunk_grow_size=self.chunk_expand_size
         )
         # update the cached array min max metadata values
         new_meta = DataSetMetaData.from_array(numpy.array(data))
@@ -41,6 +41,9 @@ var Matrix2d = {
     viewerType: ""
 };
 
+/**
+ * matrix_data is either a JSON string, or an already decoded (typed) array, e.g. fetched with HLPR_fetchNdArray.
+ */
 function matrix2d_init(canvasName, xAxisName, yAxisName, matrix_data, matrix_shape, x_min, x_max, y_min, y_max, vmin, vmax) {
 
     const dimensions = $.parseJSON(matrix_shape);
@@ -50,7 +53,7 @@ function matrix2d_init(canvasName, xAxisName, yAxisName, matrix_data, matrix_sha
         .attr("width", m)
         .attr("height", n);
     if (matrix_data) {
-        Matrix2d.data = $.parseJSON(matrix_data);
+        Matrix2d.data = typeof matrix_data === "string" ? $.parseJSON(matrix_data) : matrix_data;
         Matrix2d.vmin = vmin;
         Matrix2d.vmax = vmax;
         ColSch_initColorSchemeGUI(vmin, vmax, drawCanvas);
@@ -29,6 +29,10 @@
 #
 
 import os
+import types
+import numpy
+import pytest
+from scipy import signal
 from tvb.adapters.analyzers.cross_correlation_adapter import CrossCorrelateAdapter, PearsonCorrelationCoefficientAdapter
 from tvb.adapters.analyzers.fcd_adapter import FunctionalConnectivityDynamicsAdapter
 from tvb.adapters.analyzers.fmri_balloon_adapter import BalloonModelAdapter
@@ -38,7 +42,7 @@ from tvb.adapters.analyzers.node_coherence_adapter import NodeCoherenceAdapter
 from tvb.adapters.analyzers.node_complex_coherence_adapter import NodeComplexCoherenceAdapter
 from tvb.adapters.analyzers.node_covariance_adapter import NodeCovarianceAdapter
 from tvb.adapters.analyzers.pca_adapter import PCAAdapter
-from tvb.adapters.analyzers.wavelet_adapter import ContinuousWaveletTransformAdapter
+from tvb.adapters.analyzers.wavelet_adapter import ContinuousWaveletTransformAdapter, WaveletAdapterModel
 from tvb.adapters.datatypes.h5.fcd_h5 import FcdH5
 from tvb.adapters.datatypes.h5.graph_h5 import CovarianceH5, CorrelationCoefficientsH5
 from tvb.adapters.datatypes.h5.mode_decompositions_h5 import PrincipalComponentsH5, IndependentComponentsH5
@@ -46,7 +50,12 @@ from tvb.adapters.datatypes.h5.spectral_h5 import WaveletCoefficientsH5, Coheren
     ComplexCoherenceSpectrumH5
 from tvb.adapters.datatypes.h5.temporal_correlations_h5 import CrossCorrelationH5
 from tvb.adapters.datatypes.h5.time_series_h5 import TimeSeriesRegionH5
+from tvb.analyzers import wavelet
+from tvb.analyzers.wavelet import compute_continuous_wavelet_transform
+from tvb.basic.neotraits.api import Range
 from tvb.core.entities.file.simulator.datatype_measure_h5 import DatatypeMeasureH5
+from tvb.core.neocom import h5
+from tvb.datatypes.time_series import TimeSeries
 from tvb.tests.framework.core.base_testcase import TransactionalTestCase
 
 
@@ -70,6 +79,116 @@ class TestAdapters(TransactionalTestCase):
         result_h5 = wavelet_adapter.path_for(WaveletCoefficientsH5, wavelet_idx.gid)
         assert os.path.exists(result_h5)
 
+    def test_wavelet_adapter_node_blocks(self, time_series_index_factory, operation_from_existing_op_factory):
+        ts_index = time_series_index_factory()
+
+        wavelet_op, project_id = operation_from_existing_op_factory(ts_index.fk_from_operation)
+
+        wavelet_adapter = ContinuousWaveletTransformAdapter()
+        view_model = wavelet_adapter.get_view_model_class()()
+        view_model.time_series = ts_index.gid
+        wavelet_adapter.configure(view_model)
+        # Force one node per block
+        wavelet_adapter.memory_factor = ts_index.data_length_3d
+
+        wavelet_adapter.extract_operation_data(wavelet_op)
+        wavelet_idx = wavelet_adapter.launch(view_model)
+
+        with h5.h5_file_for_index(ts_index) as ts_h5:
+            time_series = TimeSeries(data=ts_h5.data.load(), sample_period=ts_h5.sample_period.load(),
+                                     sample_period_unit=ts_h5.sample_period_unit.load())
+        expected = compute_continuous_wavelet_transform(time_series, view_model.frequencies, view_model.sample_period,
+                                                        view_model.q_ratio, view_model.normalisation,
+                                                        view_model.mother)
+
+        result_h5 = wavelet_adapter.path_for(WaveletCoefficientsH5, wavelet_idx.gid)
+        with WaveletCoefficientsH5(result_h5) as wavelet_h5:
+            array_data = wavelet_h5.array_data.load()
+        assert array_data.shape == expected.array_data.shape
+        numpy.testing.assert_allclose(array_data, expected.array_data)
+        result_shape = wavelet_adapter.result_shape(view_model.frequencies, view_model.sample_period,
+                                                    wavelet_adapter.input_shape, time_series.sample_period)
+        assert result_shape == array_data.shape
+
+    @staticmethod
+    def _direct_wavelet_transform(time_series, freqs, sample_period, q_ratio, normalisation):
+        """
+        Reference transform, by direct convolution of each channel with each kernel
+        """
+        sample_rate = time_series.sample_rate
+        temporal_step = max(1, int(round(sample_period / time_series.sample_period)))
+        sigma_t = 1.0 / (2.0 * numpy.pi * freqs / q_ratio)
+        if normalisation == 'energy':
+            amp = 1.0 / numpy.sqrt(sample_rate * numpy.sqrt(numpy.pi) * sigma_t)
+        else:
+            amp = numpy.sqrt(2.0 / numpy.pi) / sample_rate / sigma_t
+        data = time_series.data
+        nt = int(numpy.ceil(data.shape[0] / temporal_step))
+        coef = numpy.zeros((len(freqs), nt) + data.shape[1:], dtype=numpy.complex128)
+        for i, f0 in enumerate(freqs):
+            x = numpy.arange(0, 4.0 * sigma_t[i] * sample_rate, 1) / sample_rate
+            wvlt = amp[i] * numpy.exp(-x ** 2 / (2.0 * sigma_t[i] ** 2)) * numpy.exp(2j * numpy.pi * f0 * x)
+            wvlt = numpy.hstack((numpy.conjugate(wvlt[-1:0:-1]), wvlt))
+            for channel in numpy.ndindex(*data.shape[1:]):
+                wt = signal.convolve(data[(slice(None),) + channel], wvlt, 'same')
+                coef[(i, slice(None)) + channel] = wt[0::temporal_step]
+        return coef
+
+    @pytest.mark.parametrize("nr_samples, normalisation", [(200, "energy"), (200, "gabor"), (40, "energy")])
+    def test_wavelet_transform_direct_convolution(self, nr_samples, normalisation):
+        """
+        Compare the FFT convolution of the wavelet transform with a direct convolution, for a result sample period
+        which is not a multiple of the input one (1.3 / 0.5), and with 40 samples for kernels longer than the signal
+        """
+        time_series = TimeSeries(data=numpy.random.random((nr_samples, 2, 3, 1)), sample_period=0.5,
+                                 sample_period_unit='s')
+        frequencies = Range(lo=0.2, hi=0.9, step=0.1)
+        result = compute_continuous_wavelet_transform(time_series, frequencies, 1.3, 5.0, normalisation, 'morlet')
+
+        expected = self._direct_wavelet_transform(time_series, frequencies.to_array(), 1.3, 5.0, normalisation)
+        assert result.array_data.shape == expected.shape
+        numpy.testing.assert_allclose(result.array_data, expected, rtol=0, atol=1e-12 * numpy.abs(expected).max())
+
+    def test_wavelet_transform_gpu_branch(self, monkeypatch):
+        """
+        Run the CuPy branch of the wavelet transform, with a stand-in for CuPy that has the signatures of cupy.fft,
+        and its fall back to the CPU when the device runs out of memory
+        """
+
+        class OutOfMemoryError(Exception):
+            pass
+
+        device_memory = dict(full=False)
+
+        def cupy_fft(a, n=None, axis=-1, norm=None):
+            if device_memory['full']:
+                raise OutOfMemoryError()
+            return numpy.fft.fft(a, n=n, axis=axis, norm=norm)
+
+        def cupy_ifft(a, n=None, axis=-1, norm=None):
+            return numpy.fft.ifft(a, n=n, axis=axis, norm=norm)
+
+        memory_pool = types.SimpleNamespace(free_all_blocks=lambda: None)
+        fake_cupy = types.SimpleNamespace(asarray=numpy.asarray, asnumpy=numpy.asarray,
+                                          fft=types.SimpleNamespace(fft=cupy_fft, ifft=cupy_ifft),
+                                          cuda=types.SimpleNamespace(
+                                              memory=types.SimpleNamespace(OutOfMemoryError=OutOfMemoryError)),
+                                          get_default_memory_pool=lambda: memory_pool)
+        time_series = TimeSeries(data=numpy.random.random((500, 1, 3, 1)), sample_period=0.5)
+        view_model = WaveletAdapterModel()
+
+        def transform():
+            return compute_continuous_wavelet_transform(time_series, view_model.frequencies,
+                                                        view_model.sample_period, view_model.q_ratio,
+                                                        view_model.normalisation, view_model.mother)
+
+        expected = transform()
+        monkeypatch.setattr(wavelet, 'cupy', fake_cupy)
+        monkeypatch.setattr(wavelet, 'GPU_MIN_INPUT_SIZE', 0)
+        numpy.testing.assert_allclose(transform().array_data, expected.array_data)
+        device_memory['full'] = True
+        numpy.testing.assert_allclose(transform().array_data, expected.array_data)
+
     def test_pca_adapter(self, time_series_index_factory, operation_from_existing_op_factory):
         ts_index = time_series_index_factory()
 
@@ -96,6 +96,16 @@ class TestExporters(TransactionalTestCase):
         assert file_path is not None, "Export process should return path to export file"
         assert os.path.exists(file_path), "Could not find export file: %s on disk." % file_path
 
+    def test_tvb_export_of_simple_datatype_without_copy(self, dummy_datatype_index_factory):
+        """
+        Test that a data type which needs no changes for export is served from its storage file
+        """
+        datatype = dummy_datatype_index_factory()
+        _, file_path, delete_file = self.export_manager.export_data(datatype, self.TVB_EXPORTER, self.test_project)
+
+        assert file_path == h5.path_for_stored_index(datatype), "The stored file should be exported as it is"
+        assert not delete_file, "The stored file should not be deleted after download"
+
     @staticmethod
     def compare_files(original_path, decrypted_file_path):
         buffer_size = TvbProfile.current.hpc.CRYPT_BUFFER_SIZE
@@ -34,11 +34,11 @@ import numpy
 from tvb.adapters.datatypes.db import graph
 from tvb.adapters.datatypes.db.graph import CovarianceIndex
 from tvb.adapters.datatypes.db.mode_decompositions import IndependentComponentsIndex
-from tvb.adapters.datatypes.db.spectral import CoherenceSpectrumIndex
+from tvb.adapters.datatypes.db.spectral import CoherenceSpectrumIndex, WaveletCoefficientsIndex
 from tvb.adapters.datatypes.db.temporal_correlations import CrossCorrelationIndex
 from tvb.adapters.datatypes.h5.graph_h5 import CovarianceH5
 from tvb.adapters.datatypes.h5.mode_decompositions_h5 import IndependentComponentsH5
-from tvb.adapters.datatypes.h5.spectral_h5 import CoherenceSpectrumH5
+from tvb.adapters.datatypes.h5.spectral_h5 import CoherenceSpectrumH5, WaveletCoefficientsH5
 from tvb.adapters.datatypes.h5.temporal_correlations_h5 import CrossCorrelationH5
 from tvb.core.entities.storage import dao
 from tvb.datatypes import spectral, temporal_correlations
@@ -105,6 +105,39 @@ def cross_coherence_factory(time_series_index_factory, operation_factory):
     return build
 
 
+@pytest.fixture()
+def wavelet_factory(time_series_index_factory, operation_factory):
+    def build():
+        time_series_index = time_series_index_factory()
+        time_series = h5.load_from_index(time_series_index)
+        shape = (10, 20, 1, time_series_index.data_length_3d, 1)
+        wavelet = spectral.WaveletCoefficients(source=time_series,
+                                               mother="morlet",
+                                               sample_period=1.0,
+                                               frequencies=numpy.linspace(0.008, 0.060, shape[0]),
+                                               normalisation="energy",
+                                               q_ratio=5.0,
+                                               array_data=numpy.random.random(shape) + 1j * numpy.random.random(shape))
+        wavelet.compute_amplitude()
+        wavelet.compute_phase()
+        wavelet.compute_power()
+
+        op = operation_factory()
+
+        wavelet_index = WaveletCoefficientsIndex()
+        wavelet_index.fk_from_operation = op.id
+        wavelet_index.fill_from_has_traits(wavelet)
+
+        wavelet_h5_path = h5.path_for_stored_index(wavelet_index)
+        with WaveletCoefficientsH5(wavelet_h5_path) as f:
+            f.store(wavelet)
+
+        wavelet_index = dao.store_entity(wavelet_index)
+        return wavelet_index, wavelet
+
+    return build
+
+
 @pytest.fixture()
 def cross_correlation_factory(time_series_index_factory, operation_factory):
     def build():
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import json
+import numpy
+
+from tvb.adapters.datatypes.h5 import spectral_h5
+from tvb.core.neocom import h5
+from tvb.tests.framework.core.base_testcase import TransactionalTestCase
+from tvb.adapters.visualizers.wavelet_spectrogram import WaveletSpectrogramVisualizer
+
+
+class TestWaveletSpectrogramViewer(TransactionalTestCase):
+    """
+    Unit-tests for Wavelet Spectrogram Viewer.
+    """
+
+    def test_launch(self, wavelet_factory, monkeypatch):
+        """
+        Check that all required keys are present in output from WaveletSpectrogramVisualizer launch.
+        """
+        wavelet_index, wavelet = wavelet_factory()
+        viewer = WaveletSpectrogramVisualizer()
+        view_model = viewer.get_view_model_class()()
+        view_model.input_data = wavelet_index.gid
+        # Read one node at a time
+        monkeypatch.setattr(spectral_h5, 'READ_CHUNK_BYTES', 1)
+        result = viewer.launch(view_model)
+        expected_keys = ['matrix_url', 'matrix_shape', 'start_time', 'end_time',
+                         'freq_lo', 'freq_hi', 'vmin', 'vmax']
+        for key in expected_keys:
+            assert key in result
+        assert 'get_summed_power' in result['matrix_url']
+
+        power = wavelet.power[:, :, 0, :, 0].sum(axis=2)
+        assert json.loads(result['matrix_shape']) == list(power.shape)
+        window = power[:, max(1, int(0.25 * power.shape[1])):max(1, int(0.75 * power.shape[1]))]
+        numpy.testing.assert_allclose(result['vmin'], window.min(), rtol=1e-6)
+        numpy.testing.assert_allclose(result['vmax'], window.max(), rtol=1e-6)
+
+        # The matrix served to the browser, through the binary datatype attribute URL
+        with h5.h5_file_for_gid(wavelet_index.gid) as wavelet_h5:
+            summed_power = wavelet_h5.get_summed_power()
+        assert summed_power.dtype == numpy.float32
+        numpy.testing.assert_allclose(summed_power, power, rtol=1e-6)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2022, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Tests for the helpers of tvb.core.adapters.abcdisplayer
+"""
+
+import json
+import warnings
+import numpy
+import pytest
+from tvb.core.adapters.abcdisplayer import ABCDisplayer
+
+
+class TestABCDisplayer(object):
+    """
+    Test class for the number serialization of ABCDisplayer.
+    """
+
+    @pytest.mark.parametrize("values", [
+        [1e-310, 1.23456, -2.5e10, 0.0],
+        [1e-300, 123456.0, -0.000123456, 7.0],
+        [1e-20, 123456.0, -0.000123456, 7.0],
+        [5e-324, 1.7e308],
+        [0.0, 0.0],
+        []
+    ])
+    def test_dump_with_precision(self, values):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            dumped = ABCDisplayer.dump_with_precision(numpy.array(values), 3)
+        assert json.loads(dumped) == [float("%0.3g" % value) for value in values]
+
+    @pytest.mark.parametrize("values, precision", [
+        ([2.675, 0.155, 0.125, 2.5, -0.0155, 1.005], 3),
+        ([2.675, 0.155, 0.125, 2.5, -0.0155, 1.005], 2),
+        (numpy.round(numpy.random.RandomState(42).uniform(-10, 10, 22000), 3), 2),
+        (numpy.random.RandomState(42).uniform(-10, 10, 22000) * 10.0 ** numpy.arange(-5, 5).repeat(2200), 3)
+    ])
+    def test_dump_with_precision_ties(self, values, precision):
+        """
+        Values close to a rounding tie are rounded as %g does, from their exact binary value
+        """
+        dumped = ABCDisplayer.dump_with_precision(numpy.array(values), precision)
+        format_str = "%0." + str(precision) + "g"
+        assert json.loads(dumped) == [float(format_str % value) for value in numpy.array(values).tolist()]
@@ -32,8 +32,10 @@
 .. moduleauthor:: Bogdan Neacsa <bogdan.neacsa@codemart.ro>
 .. moduleauthor:: Ionel Ortelecan <ionel.ortelecan@codemart.ro>
 """
+import pytest
 from tvb.adapters.datatypes.db.annotation import ConnectivityAnnotationsIndex
 from tvb.adapters.datatypes.db.connectivity import ConnectivityIndex
+from tvb.adapters.datatypes.db.graph import CovarianceIndex
 from tvb.adapters.datatypes.db.local_connectivity import LocalConnectivityIndex
 from tvb.adapters.datatypes.db.mapped_value import ValueWrapperIndex
 from tvb.adapters.datatypes.db.projections import ProjectionMatrixIndex
@@ -170,6 +172,29 @@ class TestRemove(TransactionalTestCase):
         res = dao.get_datatype_by_gid(series[0].gid)
         assert res is None, "The time series was not deleted."
 
+    def test_remove_used_time_series(self, time_series_region_index_factory):
+        """
+        Tries to remove a time series which is the source of a Covariance
+        """
+        conn = try_get_last_datatype(self.test_project.id, ConnectivityIndex)
+        conn = h5.load_from_index(conn)
+        rm = try_get_last_datatype(self.test_project.id, RegionMappingIndex)
+        rm = h5.load_from_index(rm)
+        time_series_region_index_factory(conn, rm, test_project=self.test_project)
+        series = self.get_all_entities(TimeSeriesRegionIndex)
+        assert 1 == len(series), "There should be only one time series"
+
+        covariance_index = CovarianceIndex()
+        covariance_index.fk_from_operation = self.operation.id
+        covariance_index.fk_source_gid = series[0].gid
+        dao.store_entity(covariance_index)
+
+        with pytest.raises(RemoveDataTypeException):
+            self.project_service.remove_datatype(self.test_project.id, series[0].gid)
+
+        res = dao.get_datatype_by_gid(series[0].gid)
+        assert series[0].id == res.id, "A used time series was deleted"
+
     def test_remove_value_wrapper(self):
         """
         Test the deletion of a value wrapper dataType
@@ -252,8 +252,9 @@ class BalloonModel(HasTraits):
         for step in range(1, t_int.shape[0]):
             state[step, :] = scheme(state[step - 1, :], self.balloon_dfun,
                                     neural_activity[step, :], local_coupling, stimulus)
-            if numpy.isnan(state[step, :]).any():
-                self.log.warning("NaNs detected...")
+        # A NaN propagates to all later steps, so one check of the whole trajectory suffices
+        if numpy.isnan(state).any():
+            self.log.warning("NaNs detected...")
 
         # NOTE: just for the sake of clarity, define the variables used in the BOLD model
         s = state[:, 0, :]
@@ -361,11 +362,15 @@ class BalloonModel(HasTraits):
 
         x = neural_input[0, :]
 
+        # v^(1/alpha) is shared by dv and dq, and (1 - E0)^(1/f) = exp(log(1 - E0) / f) needs a single exp
+        # per node instead of a pow with an array exponent
+        v_alpha = v ** (1. / self.alpha)
+        extraction = 1. - numpy.exp(numpy.log(1. - self.E0) / f)
+
         ds = x - (1. / self.tau_s) * s - (1. / self.tau_f) * (f - 1)
         df = s
-        dv = (1. / self.tau_o) * (f - v ** (1. / self.alpha))
-        dq = (1. / self.tau_o) * ((f * (1. - (1. - self.E0) ** (1. / f)) / self.E0) -
-                                  (v ** (1. / self.alpha)) * (q / v))
+        dv = (1. / self.tau_o) * (f - v_alpha)
+        dq = (1. / self.tau_o) * ((f * extraction / self.E0) - v_alpha * (q / v))
 
         return numpy.array([ds, df, dv, dq])
 
@@ -39,15 +39,33 @@ WaveletSpectrum datatype.
 
 """
 
+import collections
 import numpy
-import scipy.signal as signal
+import scipy.fft
 import tvb.datatypes.spectral as spectral
 from tvb.basic.logger.builder import get_logger
 from tvb.basic.neotraits.api import HasTraits, Attr, Range, Float, narray_describe
 from tvb.simulator.backend.ref import ReferenceBackend
 
+try:
+    import cupy
+    # CuPy can be installed on hosts without a CUDA device, use it only when one is available
+    if cupy.cuda.runtime.getDeviceCount() == 0:
+        cupy = None
+except Exception:
+    cupy = None
+
 SUPPORTED_WAVELET_FUNCTIONS = ("morlet",)
 
+# Scales are transformed in tiles of SCALE_TILE kernels, and channels (var x node x mode) in tiles which keep the
+# complex working set of one (scale tile x channel tile) product below TILE_BYTES
+SCALE_TILE = 8
+TILE_BYTES = 4 * 1024 ** 2
+# When CuPy is installed, inputs with at least this many values (time x channels) are transformed on the GPU
+GPU_MIN_INPUT_SIZE = 10 ** 6
+# Number of threads for the CPU FFTs (scipy.fft workers, negative counts from the number of CPUs)
+FFT_WORKERS = -1
+
 log = get_logger(__name__)
 
 """
@@ -66,35 +84,24 @@ References:
 """
 
 
-def compute_continuous_wavelet_transform(time_series, frequencies, sample_period, q_ratio, normalisation, mother):
+def _asnumpy(array):
     """
-    # type: (TimeSeries, Range, float, float, str, str)  -> WaveletCoefficients
-    Calculate the continuous wavelet transform of time_series.
-
-    Parameters
-    __________
-
-    time_series : TimeSeries
-    The timeseries to which the wavelet is to be applied.
-
-    frequencies : Range
-    The frequency resolution and range returned. Requested frequencies
-    are converted internally into appropriate scales.
+    Bring an array computed with either NumPy or CuPy into host memory.
+    """
+    if cupy is not None:
+        return cupy.asnumpy(array)
+    return array
 
-    sample_period : float
-    The sampling period of the computed wavelet spectrum.
 
-    q_ratio : float
-    NFC. Must be greater than 5. Ratios of the center frequencies to bandwidths.
+WaveletKernels = collections.namedtuple('WaveletKernels', 'frequencies nt temporal_step nfft starts kernels_fft')
 
-    normalisation : str
-    The type of normalisation for the resulting wavet spectrum. Default is 'energy', options are: 'energy'; 'gabor'.
 
-    mother : str
-    The mother wavelet function used in the transform.
+def check_frequencies(frequencies):
+    """
+    # type: (Range)  -> (Range, numpy.ndarray)
+    Return the frequency range actually used for the transform, and the array of its frequencies.
+    A zero step, or a range without valid (positive) frequencies, are replaced by defaults.
     """
-    ts_shape = time_series.data.shape
-
     if frequencies.step == 0:
         log.warning("Frequency step can't be 0! Trying default step, 2e-3.")
         frequencies.step = 0.002
@@ -110,6 +117,30 @@ def compute_continuous_wavelet_transform(time_series, frequencies, sample_period
         frequencies = Range(lo=0.008, hi=0.060, step=0.002)
         freqs = numpy.arange(frequencies.lo, frequencies.hi,
                              frequencies.step)
+    return frequencies, freqs
+
+
+def padded_fft_length(nr_samples, freqs, q_ratio, sample_rate):
+    """
+    Length of the FFTs of the transform: nr_samples zero padded enough for a linear convolution with the longest
+    (lowest frequency) kernel, rounded up to a fast FFT size.
+    """
+    sigma_f = freqs / q_ratio
+    sigma_t = 1.0 / (2.0 * numpy.pi * sigma_f)
+    max_kernel_len = 2 * int(numpy.ceil(4.0 * numpy.nanmax(sigma_t) * sample_rate)) - 1
+    return scipy.fft.next_fast_len(nr_samples + max_kernel_len - 1)
+
+
+def build_kernels(time_series, nr_samples, frequencies, sample_period, q_ratio, normalisation, mother):
+    """
+    # type: (TimeSeries, int, Range, float, float, str, str)  -> WaveletKernels
+    Build the spectra of the wavelet kernels, for all the requested frequencies.
+
+    The kernels depend only on the parameters of the transform, on the sample period of time_series and on its
+    number of time points (nr_samples), not on its data. They can be built once, and applied with apply_kernels
+    to any block of (var, node, mode) channels of a time series with nr_samples time points.
+    """
+    frequencies, freqs = check_frequencies(frequencies)
 
     log.debug("freqs")
     log.debug(narray_describe(freqs))
@@ -120,7 +151,7 @@ def compute_continuous_wavelet_transform(time_series, frequencies, sample_period
     # some of the original argument names
     nf = len(freqs)
     temporal_step = max((1, ReferenceBackend.iround(sample_period / time_series.sample_period)))
-    nt = int(numpy.ceil(ts_shape[0] / temporal_step))
+    nt = int(numpy.ceil(nr_samples / temporal_step))
 
     if not isinstance(q_ratio, numpy.ndarray):
         new_q_ratio = q_ratio * numpy.ones((1, nf))
@@ -145,14 +176,12 @@ def compute_continuous_wavelet_transform(time_series, frequencies, sample_period
     elif normalisation == 'gabor':
         Amp = numpy.sqrt(2.0 / numpy.pi) / sample_rate / sigma_t
 
-    coef_shape = (nf, nt, ts_shape[1], ts_shape[2], ts_shape[3])
-
-    coef = numpy.zeros(coef_shape, dtype=numpy.complex128)
-    log.debug("coef")
-    log.debug(narray_describe(coef))
+    nfft = padded_fft_length(nr_samples, freqs, new_q_ratio, sample_rate)
 
-    scales = numpy.arange(0, nf, 1)
-    for i in scales:
+    # All kernels are zero padded in one array and transformed together, as one batch of FFTs
+    kernels_fft = numpy.zeros((nf, nfft), dtype=numpy.complex128)
+    starts = []
+    for i in range(nf):
         f0 = freqs[i]
         SDt = sigma_t[(0, i)]
         A = Amp[(0, i)]
@@ -160,20 +189,119 @@ def compute_continuous_wavelet_transform(time_series, frequencies, sample_period
         wvlt = A * numpy.exp(-x ** 2 / (2.0 * SDt ** 2)) * numpy.exp(2j * numpy.pi * f0 * x)
         wvlt = numpy.hstack((numpy.conjugate(wvlt[-1:0:-1]), wvlt))
         # util.self.log_debug_array(self.log, wvlt, "wvlt")
+        kernels_fft[i, :wvlt.shape[0]] = wvlt
+        # Keep the central part of the full convolution, as signal.convolve(data, wvlt, 'same') does
+        starts.append((wvlt.shape[0] - 1) // 2)
+    starts = numpy.array(starts)
+    kernels_fft = scipy.fft.fft(kernels_fft, axis=1, overwrite_x=True, workers=FFT_WORKERS)
+
+    return WaveletKernels(frequencies, nt, temporal_step, nfft, starts, kernels_fft)
 
-        for var in range(ts_shape[1]):
-            for node in range(ts_shape[2]):
-                for mode in range(ts_shape[3]):
-                    data = time_series.data[:, var, node, mode]
-                    wt = signal.convolve(data, wvlt, 'same')
-                    # util.self.log_debug_array(self.log, wt, "wt")
-                    res = wt[0::temporal_step]
-                    # NOTE: this is a horrible horrible quick hack (alas, a solution) to avoid broadcasting errors
-                    # when using dt and sample periods which are not powers of 2.
-                    coef[i, :, var, node, mode] = res if len(res) == nt else res[:coef.shape[1]]
+
+def _convolve_channels(data, kernels, coef_channels, xp, fft, fft_kwargs, ifft_kwargs):
+    """
+    Convolve the (time, channel) data with the kernels, with the array module xp and its fft module, and write the
+    kept samples into the (frequency, time, channel) coef_channels.
+    """
+    nf = kernels.kernels_fft.shape[0]
+    nt = kernels.nt
+    nfft = kernels.nfft
+    data_fft = fft.fft(xp.asarray(data), n=nfft, axis=0, **fft_kwargs)
+
+    n_channels = data.shape[1]
+    channel_tile = max(1, TILE_BYTES // (SCALE_TILE * nfft * 16))
+
+    # Outer loop over tiles of scales, so that each kernel is moved to the device once for all channel tiles
+    for s0 in range(0, nf, SCALE_TILE):
+        s1 = min(s0 + SCALE_TILE, nf)
+        wvlt_fft = xp.asarray(kernels.kernels_fft[s0:s1])
+        # Time indices of the kept (central, down sampled) samples, for every scale of the tile: the nt samples
+        # start:start + T:temporal_step of each full convolution, gathered for all scales at once
+        scale_idx = xp.asarray(numpy.arange(s1 - s0)[:, numpy.newaxis])
+        time_idx = xp.asarray(kernels.starts[s0:s1, numpy.newaxis] + numpy.arange(nt) * kernels.temporal_step)
+
+        for c0 in range(0, n_channels, channel_tile):
+            c1 = min(c0 + channel_tile, n_channels)
+            wt = fft.ifft(wvlt_fft[:, :, numpy.newaxis] * data_fft[numpy.newaxis, :, c0:c1], axis=1, **ifft_kwargs)
+            coef_channels[s0:s1, :, c0:c1] = _asnumpy(wt[scale_idx, time_idx])
+
+
+def apply_kernels(data, kernels):
+    """
+    # type: (numpy.ndarray, WaveletKernels)  -> numpy.ndarray
+    Convolve the 4D (time, var, node, mode) data with kernels built by build_kernels, along the time axis.
+    Returns the complex coefficients, shaped (frequency, time, var, node, mode).
+    """
+    ts_shape = data.shape
+    nf = kernels.kernels_fft.shape[0]
+    nt = kernels.nt
+
+    coef_shape = (nf, nt, ts_shape[1], ts_shape[2], ts_shape[3])
+
+    coef = numpy.zeros(coef_shape, dtype=numpy.complex128)
+    log.debug("coef")
+    log.debug(narray_describe(coef))
+
+    # All (var, node, mode) channels are convolved at once, along the time axis,
+    # and the spectrum of the signal is computed only once
+    data = data.reshape((ts_shape[0], -1))
+    coef_channels = coef.reshape((nf, nt, data.shape[1]))
+
+    # The products of the spectra are temporaries, transformed back in place; the input data is not overwritten.
+    # cupy.fft takes neither the workers nor the overwrite_x arguments of scipy.fft
+    on_cpu = numpy, scipy.fft, dict(workers=FFT_WORKERS), dict(workers=FFT_WORKERS, overwrite_x=True)
+    if cupy is not None and data.size >= GPU_MIN_INPUT_SIZE:
+        log.debug("Computing the wavelet transform on the GPU")
+        try:
+            _convolve_channels(data, kernels, coef_channels, cupy, cupy.fft, dict(), dict())
+        except cupy.cuda.memory.OutOfMemoryError:
+            log.warning("Not enough GPU memory for the wavelet transform, computing it on the CPU")
+            cupy.get_default_memory_pool().free_all_blocks()
+            _convolve_channels(data, kernels, coef_channels, *on_cpu)
+    else:
+        _convolve_channels(data, kernels, coef_channels, *on_cpu)
 
     log.debug("coef")
     log.debug(narray_describe(coef))
+    return coef
+
+
+def compute_continuous_wavelet_transform(time_series, frequencies, sample_period, q_ratio, normalisation, mother,
+                                         kernels=None):
+    """
+    # type: (TimeSeries, Range, float, float, str, str, WaveletKernels)  -> WaveletCoefficients
+    Calculate the continuous wavelet transform of time_series.
+
+    Parameters
+    __________
+
+    time_series : TimeSeries
+    The timeseries to which the wavelet is to be applied.
+
+    frequencies : Range
+    The frequency resolution and range returned. Requested frequencies
+    are converted internally into appropriate scales.
+
+    sample_period : float
+    The sampling period of the computed wavelet spectrum.
+
+    q_ratio : float
+    NFC. Must be greater than 5. Ratios of the center frequencies to bandwidths.
+
+    normalisation : str
+    The type of normalisation for the resulting wavet spectrum. Default is 'energy', options are: 'energy'; 'gabor'.
+
+    mother : str
+    The mother wavelet function used in the transform.
+
+    kernels : WaveletKernels
+    Optional, kernels already built by build_kernels with the same parameters, e.g. for another block of nodes.
+    """
+    if kernels is None:
+        kernels = build_kernels(time_series, time_series.data.shape[0], frequencies, sample_period, q_ratio,
+                                normalisation, mother)
+    frequencies = kernels.frequencies
+    coef = apply_kernels(time_series.data, kernels)
 
     spectra = spectral.WaveletCoefficients(
         source=time_series,
@@ -38,7 +38,10 @@ code.
 
 import os
 import importlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+from numpy.lib.format import open_memmap
 import autopep8
 
 from .templates import MakoUtilMix
@@ -47,6 +50,12 @@ from tvb.simulator.lab import *
 
 class NbMPRBackend(MakoUtilMix):
 
+    # Functions evaluated from rendered sources, by (source, name). The parameters are rendered into the
+    # source, so simulations with the same configuration reuse the already jitted functions; only the
+    # EVALUATED_SOURCES_SIZE most recently used are kept, so that parameter sweeps do not grow it without bound
+    EVALUATED_SOURCES_SIZE = 16
+    _evaluated_sources = OrderedDict()
+
     def build_py_func(self, template_source, content, name='kernel', print_source=False,
             modname=None):
         "Build and retrieve one or more Python functions from template."
@@ -60,6 +69,10 @@ class NbMPRBackend(MakoUtilMix):
             return self.eval_source(source, name)
 
     def eval_source(self, source, name):
+        key = source, name
+        if key in self._evaluated_sources:
+            self._evaluated_sources.move_to_end(key)
+            return self._evaluated_sources[key]
         globals_ = {}
         try:
             exec(source, globals_)
@@ -68,7 +81,11 @@ class NbMPRBackend(MakoUtilMix):
                 print(self._insert_line_numbers(source))
             raise exc
         fns = [globals_[n] for n in name.split(',')]
-        return fns[0] if len(fns)==1 else fns
+        fns = fns[0] if len(fns)==1 else fns
+        self._evaluated_sources[key] = fns
+        while len(self._evaluated_sources) > self.EVALUATED_SOURCES_SIZE:
+            self._evaluated_sources.popitem(last=False)
+        return fns
 
     def eval_module(self, source, name, modname):
         here = os.path.abspath(os.path.dirname(__file__))
@@ -100,7 +117,8 @@ class NbMPRBackend(MakoUtilMix):
         # stimulus evaluated outside the backend, no restrictions
 
 
-    def run_sim(self, sim, nstep=None, simulation_length=None, chunksize=100000, compatibility_mode=False):
+    def run_sim(self, sim, nstep=None, simulation_length=None, chunksize=100000, compatibility_mode=False,
+                out_path=None):
         assert nstep is not None or simulation_length is not None or sim.simulation_length is not None
 
         self.check_compatibility(sim)
@@ -109,19 +127,31 @@ class NbMPRBackend(MakoUtilMix):
                 simulation_length = sim.simulation_length
             nstep = int(np.ceil(simulation_length/sim.integrator.dt))
 
+        data = None
         if isinstance(sim.monitors[0], monitors.Raw):
+            if out_path is not None:
+                raise NotImplementedError("Memory mapped output only supported with a TemporalAverage monitor.")
             svar_bufs = self._run_sim_plain(sim, nstep, compatibility_mode=compatibility_mode)
             time = np.arange(svar_bufs[0].shape[1]) * sim.integrator.dt
         elif isinstance(sim.monitors[0], monitors.TemporalAverage):
-            svar_bufs = self._run_sim_tavg_chunked(sim, nstep, chunksize=chunksize, compatibility_mode=compatibility_mode)
+            # with an out_path, the averages are written chunk by chunk into a memory mapped .npy file
+            if out_path is not None:
+                data = open_memmap(out_path, mode='w+', dtype=np.float64,
+                                   shape=(nstep // sim.monitors[0].istep, sim.model.nvar,
+                                          sim.connectivity.number_of_regions, 1))
+            svar_bufs = self._run_sim_tavg_chunked(sim, nstep, chunksize=chunksize,
+                                                   compatibility_mode=compatibility_mode, out=data)
             T = sim.monitors[0].period
             time = np.arange(svar_bufs[0].shape[1]) * T + 0.5 * T
         else:
             raise NotImplementedError("Only Raw or TemporalAverage monitors supported.")
-        data = np.concatenate(
-                [svar_buf.T[:,np.newaxis,:, np.newaxis] for svar_buf in svar_bufs],
-                axis=1
-        )
+        if data is None:
+            data = np.concatenate(
+                    [svar_buf.T[:,np.newaxis,:, np.newaxis] for svar_buf in svar_bufs],
+                    axis=1
+            )
+        else:
+            data.flush()
         return (time, data),   
 
     def _run_sim_plain(self, sim, nstep=None, compatibility_mode=False):
@@ -161,11 +191,12 @@ class NbMPRBackend(MakoUtilMix):
         )
         return [svar_buf[:,horizon:] for svar_buf in svar_bufs]
 
-    def _time_average(self, ts, istep):
+    def _time_average(self, ts, istep, out=None):
         N, T = ts.shape
-        return np.mean(ts.reshape(N,T//istep,istep),-1) # length of ts better be multiple of istep 
+        # averaged straight into out when given, without an intermediate array
+        return np.mean(ts.reshape(N,T//istep,istep),-1,out=out) # length of ts better be multiple of istep 
 
-    def _run_sim_tavg_chunked(self, sim, nstep, chunksize, compatibility_mode=False):
+    def _run_sim_tavg_chunked(self, sim, nstep, chunksize, compatibility_mode=False, out=None):
         template = '<%include file="nb-montbrio.py.mako"/>'
         content = dict(sim=sim, compatibility_mode=compatibility_mode) 
         integrate = self.build_py_func(template, content, name='integrate', print_source=False)
@@ -181,50 +212,57 @@ class NbMPRBackend(MakoUtilMix):
 
 
         assert nstep % tavg_steps == 0
-        svar_outs = [svar_out for svar_out in np.zeros((sim.model.nvar,N,nstep//tavg_steps))]
+        if out is None:
+            svar_outs = [svar_out for svar_out in np.zeros((sim.model.nvar,N,nstep//tavg_steps))]
+        else:
+            # (node, time) views of a (time, svar, node, mode) output, e.g. memory mapped by run_sim
+            svar_outs = [out[:, i, :, 0].T for i in range(sim.model.nvar)]
 
         svar_bufs = [buf for buf in sim.integrator.noise.generate( shape=(sim.model.nvar,N,chunksize+horizon) ) * gf]
         for i, svar_buf in enumerate(svar_bufs):
             svar_buf[:,:horizon] = np.roll(sim.history.buffer[:,i,:,0], -1, axis=0).T
 
 
-        for chunk, _ in enumerate(range(horizon, nstep+horizon, chunksize)):
-            if sim.stimulus is None:
-                stimulus = None
-            else:
-                sim.stimulus.configure_space()
-                sim.stimulus.configure_time(
-                        np.arange(chunk*chunksize, (chunk+1)*chunksize)*sim.integrator.dt
+        # The noise of the next chunk is generated by a worker thread while the current chunk is integrated
+        # (integrate releases the GIL); the draws are made in the same order as when generated in between chunks
+        with ThreadPoolExecutor(max_workers=1) as noise_pool:
+            for chunk, _ in enumerate(range(horizon, nstep+horizon, chunksize)):
+                next_noise = noise_pool.submit(self._generate_noise, sim, (sim.model.nvar, N, chunksize), gf)
+                if sim.stimulus is None:
+                    stimulus = None
+                else:
+                    sim.stimulus.configure_space()
+                    sim.stimulus.configure_time(
+                            np.arange(chunk*chunksize, (chunk+1)*chunksize)*sim.integrator.dt
+                    )
+                    stimulus = sim.stimulus()
+                svar_bufs = integrate(
+                    N = N,
+                    dt = sim.integrator.dt,
+                    nstep = chunksize,
+                    i0 = horizon,
+                    **dict(zip(sim.model.state_variables,svar_bufs)),
+                    weights = sim.connectivity.weights, 
+                    idelays = sim.connectivity.idelays,
+                    parmat = sim.model.spatial_parameter_matrix,
+                    stimulus = stimulus
                 )
-                stimulus = sim.stimulus()
-            svar_bufs = integrate(
-                N = N,
-                dt = sim.integrator.dt,
-                nstep = chunksize,
-                i0 = horizon,
-                **dict(zip(sim.model.state_variables,svar_bufs)),
-                weights = sim.connectivity.weights, 
-                idelays = sim.connectivity.idelays,
-                parmat = sim.model.spatial_parameter_matrix,
-                stimulus = stimulus
-            )
 
-            tavg_chunk = chunk * tavg_chunksize
-            svar_chunks = [self._time_average(svar[:, horizon:], tavg_steps) for svar in svar_bufs]
-            if tavg_chunk+tavg_chunksize > svar_outs[0].shape[1]:
-                cutoff = tavg_chunk+tavg_chunksize - svar_outs[0].shape[1]
-                for svar_chunk in svar_chunks:
-                    svar_chunk = svar_chunk[:,:-cutoff]
-                    
-            for svar_out, svar_chunk in zip (svar_outs, svar_chunks):
-                svar_out[:,tavg_chunk:tavg_chunk+tavg_chunksize] = svar_chunk
+                tavg_chunk = chunk * tavg_chunksize
+                # the last chunk may run past the end of the simulation, its extra samples are dropped
+                tavg_len = min(tavg_chunksize, svar_outs[0].shape[1] - tavg_chunk)
+                for svar_out, svar_buf in zip(svar_outs, svar_bufs):
+                    self._time_average(svar_buf[:, horizon:horizon + tavg_len * tavg_steps], tavg_steps,
+                                       out=svar_out[:, tavg_chunk:tavg_chunk + tavg_len])
 
-            for svar_buf in svar_bufs:
-                svar_buf[:,:horizon] = svar_buf[:,-horizon:]
+                for svar_buf in svar_bufs:
+                    svar_buf[:,:horizon] = svar_buf[:,-horizon:]
 
 
-            for svar_buf, svar_noise in zip(svar_bufs, sim.integrator.noise.generate( shape=(sim.model.nvar,N,chunksize) ) * gf):
-                svar_buf[:,horizon:] = svar_noise
-
+                for svar_buf, svar_noise in zip(svar_bufs, next_noise.result()):
+                    svar_buf[:,horizon:] = svar_noise
 
         return svar_outs
+
+    def _generate_noise(self, sim, shape, gf):
+        return sim.integrator.noise.generate(shape=shape) * gf
@@ -42,6 +42,13 @@ import numba as nb
     stochastic = isinstance(sim.integrator, IntegratorStochastic)
 
     cvar_symbols =  ','.join([f'{cvar}_c' for cvar in cvars])
+    # In compatibility mode the nodes of one step only read the buffers at earlier steps, and only write
+    # their own column, so they can be integrated in parallel. Otherwise the second coupling evaluation
+    # reads step i, which other nodes are writing, and the node loop has to stay sequential.
+    parallel = compatibility_mode
+    # Fast math without the no-NaN/no-Inf assumptions, which diverging simulations would break, and without
+    # reassociation, which would change the order of the coupling sums
+    fastmath = "{'nsz', 'arcp', 'contract', 'afn'}"
 %>
 
 # Coupling
@@ -55,8 +62,10 @@ def cx(t, i, N, weights, ${','.join(cvars)}, idelays):
     ${cterm} = 0.0
 % endfor
     for j in range(N):
+        # delayed time index, loaded and computed once for all the coupled variables
+        t_j = t - idelays[i, j]
 % for cterm, cvar in zip(sim.model.coupling_terms, cvars):
-        x_j = ${cvar}[j, t - idelays[i,j]]
+        x_j = ${cvar}[j, t_j]
         ${cterm} +=  weights[i, j]* ${sim.coupling.pre_expr}
 % endfor
 % for cterm, cvar in zip(sim.model.coupling_terms, cvars):
@@ -72,10 +81,10 @@ def cx(t, i, N, weights, ${','.join(cvars)}, idelays):
 ${'' if debug_nojit else '@nb.njit(inline="always")'}
 def bound_${svar}(x):
 % if lo > -np.inf: # this doesn't work, fix later
-    x = x if x >= ${lo} else ${lo} 
+    x = max(x, ${lo})
 % endif
 % if hi < np.inf:
-    x = x if x <= ${hi} else ${hi}
+    x = min(x, ${hi})
 % endif
     return x
 % endfor
@@ -93,7 +102,7 @@ def bound_${svar}(x):
 </%def>
 
 
-@nb.njit
+@nb.njit(parallel=${parallel}, nogil=True, fastmath=${fastmath}, error_model='numpy', boundscheck=False)
 def integrate(
         N,       # number of regions
         dt,
@@ -109,7 +118,7 @@ def integrate(
 ):
 
     for i in range(i0, i0 + nstep):
-        for n in range(N):
+        for n in ${'nb.prange' if parallel else 'range'}(N):
             ${cvar_symbols} = cx(i-1, n, N, weights, ${','.join(cvars)}, idelays)
 
 % for svar in sim.model.state_variables:
@@ -27,6 +27,8 @@
 #   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
 #
 #
+import os
+import tempfile
 import numpy
 import numpy as np
 import scipy.sparse as ss
@@ -291,6 +293,62 @@ class TestNbSim(BaseTestSim):
         np.testing.assert_allclose(r_pdq_chu, r_tvb, atol=1e-4, rtol=0.)
         np.testing.assert_allclose(V_pdq_chu, V_tvb, atol=1e-4, rtol=0.)
 
+    def test_tavg_chunking_partial_last_chunk(self):
+        sim = simulator.Simulator(
+            model=models.MontbrioPazoRoxin(),
+            coupling=coupling.Linear(a=np.array([0.1])),
+            connectivity=self._random_network(N=10, speed=2.),
+            conduction_speed=2.,
+            monitors=[
+                monitors.TemporalAverage(period=1)
+            ],
+            integrator=integrators.HeunStochastic(
+                dt=0.01,
+                noise=noise.Additive(
+                    nsig=np.array([0.0, 0.0]),
+                    noise_seed=42
+                )
+            )
+        ).configure()
+
+        # the last chunk runs past nstep, its extra samples are dropped
+        (pdq_t, pdq_d), = NbMPRBackend().run_sim(sim, nstep=1500, chunksize=1000, compatibility_mode=True)
+        (pdq_chu_t, pdq_chu_d), = NbMPRBackend().run_sim(sim, nstep=1500, chunksize=500, compatibility_mode=True)
+
+        assert pdq_d.shape == (15, 2, 10, 1)
+        np.testing.assert_allclose(pdq_t, pdq_chu_t)
+        np.testing.assert_allclose(pdq_d, pdq_chu_d)
+
+    def test_tavg_memmap_output(self):
+        sim = simulator.Simulator(
+            model=models.MontbrioPazoRoxin(),
+            coupling=coupling.Linear(a=np.array([0.1])),
+            connectivity=self._random_network(N=10, speed=2.),
+            conduction_speed=2.,
+            monitors=[
+                monitors.TemporalAverage(period=1)
+            ],
+            integrator=integrators.HeunStochastic(
+                dt=0.01,
+                noise=noise.Additive(
+                    nsig=np.array([0.0, 0.0]),
+                    noise_seed=42
+                )
+            )
+        ).configure()
+
+        (pdq_t, pdq_d), = NbMPRBackend().run_sim(sim, nstep=1500, chunksize=500, compatibility_mode=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = os.path.join(tmp_dir, 'tavg.npy')
+            (pdq_mm_t, pdq_mm_d), = NbMPRBackend().run_sim(sim, nstep=1500, chunksize=500,
+                                                           compatibility_mode=True, out_path=out_path)
+
+            assert isinstance(pdq_mm_d, np.memmap)
+            np.testing.assert_allclose(pdq_t, pdq_mm_t)
+            np.testing.assert_allclose(pdq_d, pdq_mm_d)
+            np.testing.assert_allclose(pdq_d, np.load(out_path))
+            del pdq_mm_d
+
     def test_stim(self):
 
         G = 0.525
@@ -445,3 +503,66 @@ class TestNbSim(BaseTestSim):
         (tvb_t, tvb_d), = sim.run(simulation_length=simulation_length)
 
         np.testing.assert_allclose(tvb_d, pdq_d, rtol=1e-4)
+
+    def test_integrate_reused(self):
+        sim = simulator.Simulator(
+            model=models.MontbrioPazoRoxin(),
+            coupling=coupling.Linear(a=np.array([0.1])),
+            connectivity=self._random_network(N=10),
+            conduction_speed=np.inf,
+            monitors=[
+                monitors.Raw()
+            ],
+            integrator=integrators.HeunStochastic(
+                dt=0.01,
+                noise=noise.Additive(
+                    nsig=np.array([0.0, 0.0]),
+                    noise_seed=42
+                )
+            )
+        ).configure()
+
+        template = '<%include file="nb-montbrio.py.mako"/>'
+        content = dict(sim=sim, compatibility_mode=True)
+        integrate = NbMPRBackend().build_py_func(template, content, name='integrate')
+        assert NbMPRBackend().build_py_func(template, content, name='integrate') is integrate
+
+        content = dict(sim=sim, compatibility_mode=False)
+        assert NbMPRBackend().build_py_func(template, content, name='integrate') is not integrate
+
+    def test_integrate_cache_bounded(self):
+        sim = simulator.Simulator(
+            model=models.MontbrioPazoRoxin(),
+            coupling=coupling.Linear(a=np.array([0.1])),
+            connectivity=self._random_network(N=10),
+            conduction_speed=np.inf,
+            monitors=[
+                monitors.Raw()
+            ],
+            integrator=integrators.HeunStochastic(
+                dt=0.01,
+                noise=noise.Additive(
+                    nsig=np.array([0.0, 0.0]),
+                    noise_seed=42
+                )
+            )
+        ).configure()
+
+        template = '<%include file="nb-montbrio.py.mako"/>'
+        content = dict(sim=sim, compatibility_mode=True)
+        cache_size = NbMPRBackend.EVALUATED_SOURCES_SIZE
+        NbMPRBackend.EVALUATED_SOURCES_SIZE = 2
+        try:
+            integrate = NbMPRBackend().build_py_func(template, content, name='integrate')
+            # the coupling parameters are rendered into the source, another value gets its own entry
+            sim.coupling.a = np.array([0.2])
+            assert NbMPRBackend().build_py_func(template, content, name='integrate') is not integrate
+            for a in (0.3, 0.4, 0.5):
+                sim.coupling.a = np.array([a])
+                NbMPRBackend().build_py_func(template, content, name='integrate')
+                assert len(NbMPRBackend._evaluated_sources) <= 2
+            # the least recently used entries are evicted
+            sim.coupling.a = np.array([0.1])
+            assert NbMPRBackend().build_py_func(template, content, name='integrate') is not integrate
+        finally:
+            NbMPRBackend.EVALUATED_SOURCES_SIZE = cache_size
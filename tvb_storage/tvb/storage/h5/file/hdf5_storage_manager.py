@@ -55,6 +55,8 @@ LOG = get_logger(__name__)
 
 LOCK_OPEN_FILE = threading.Lock()
 BUFFER_SIZE = 300
+# Upper bound for the size of the chunks given by chunk_grow_size, the default HDF5 chunk cache of one dataset
+MAX_CHUNK_BYTES = 1024 ** 2
 
 
 class HDF5StorageManager(object):
@@ -127,7 +129,8 @@ class HDF5StorageManager(object):
             self.data_encryption_handler.push_folder_to_sync(FilesHelper.get_project_folder_from_h5(
                 self.__storage_full_name))
 
-    def append_data(self, data_list, dataset_name='', grow_dimension=-1, close_file=True, where=ROOT_NODE_PATH):
+    def append_data(self, data_list, dataset_name='', grow_dimension=-1, close_file=True, where=ROOT_NODE_PATH,
+                    chunk_grow_size=None):
         """
         This method appends data to an existing data set. If the data set does not exists, create it first.
 
@@ -137,6 +140,9 @@ class HDF5StorageManager(object):
         :param close_file: Specify if the file should be closed automatically after write operation. If not,
             you have to close file by calling method close_file()
         :param where: represents the path where to store our dataset (e.g. /data/info)
+        :param chunk_grow_size: used only when the data set is created. When given, the chunks have this size on
+            grow_dimension and the size of data_list on the other dimensions, halved as needed to keep them under
+            MAX_CHUNK_BYTES, otherwise h5py chooses them
 
         """
         data_to_store = self._check_data(data_list)
@@ -154,8 +160,12 @@ class HDF5StorageManager(object):
                 data_shape_list = list(data_to_store.shape)
                 data_shape_list[grow_dimension] = None
                 data_shape = tuple(data_shape_list)
+                chunks = None
+                if chunk_grow_size is not None:
+                    chunks = self._chunk_shape(data_to_store.shape, data_to_store.dtype.itemsize, grow_dimension,
+                                               chunk_grow_size)
                 dataset = hdf5_file.create_dataset(where + dataset_name, data=data_to_store, shape=data_to_store.shape,
-                                                   dtype=data_to_store.dtype, maxshape=data_shape)
+                                                   dtype=data_to_store.dtype, maxshape=data_shape, chunks=chunks)
                 self.data_buffers[datapath] = HDF5StorageManager.H5pyStorageBuffer(dataset,
                                                                                    buffered_data=None,
                                                                                    grow_dimension=grow_dimension)
@@ -167,6 +177,23 @@ class HDF5StorageManager(object):
         self.data_encryption_handler.push_folder_to_sync(
             FilesHelper.get_project_folder_from_h5(self.__storage_full_name))
 
+    @staticmethod
+    def _chunk_shape(data_shape, itemsize, grow_dimension, chunk_grow_size):
+        """
+        Chunk shape with chunk_grow_size on grow_dimension and data_shape on the other dimensions. While the chunk
+        is bigger than MAX_CHUNK_BYTES, its largest other dimension is halved.
+        """
+        chunks = [max(1, size) for size in data_shape]
+        grow_dimension = grow_dimension % len(chunks)
+        chunks[grow_dimension] = min(chunk_grow_size, chunks[grow_dimension])
+        other_dimensions = [dim for dim in range(len(chunks)) if dim != grow_dimension]
+        while other_dimensions and numpy.prod(chunks) * itemsize > MAX_CHUNK_BYTES:
+            largest = max(other_dimensions, key=lambda dim: chunks[dim])
+            if chunks[largest] == 1:
+                break
+            chunks[largest] = (chunks[largest] + 1) // 2
+        return tuple(chunks)
+
     def remove_data(self, dataset_name='', where=ROOT_NODE_PATH):
         """
         Deleting a data set from H5 file.
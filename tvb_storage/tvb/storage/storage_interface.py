@@ -37,6 +37,7 @@ All calls to methods from this module must be done through this class.
 
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from tvb.basic.logger.builder import get_logger
@@ -70,6 +71,8 @@ class StorageInterface:
 
     EXPORT_FOLDER_NAME = "EXPORT_TMP"
     EXPORT_FOLDER = os.path.join(TvbProfile.current.TVB_STORAGE, EXPORT_FOLDER_NAME)
+    # Maximum number of files copied in parallel when exporting a datatype group
+    EXPORT_WORKERS = 8
 
     logger = get_logger(__name__)
 
@@ -474,18 +477,25 @@ class StorageInterface:
         else:
             export_folder = self.__build_data_export_folder(data, self.EXPORT_FOLDER)
 
+        files_to_export = dict()
         for op_folder, files in op_file_dict.items():
             tmp_op_folder_path = os.path.join(export_folder, os.path.basename(op_folder))
             for file in files:
                 dest_path = os.path.join(tmp_op_folder_path, os.path.basename(file))
 
-                if not os.path.exists(dest_path):
-                    self.copy_file(file, os.path.join(tmp_op_folder_path, os.path.basename(file)))
-                    self.get_storage_manager(dest_path).remove_metadata('parent_burst', check_existence=True)
+                if dest_path not in files_to_export and not os.path.exists(dest_path):
+                    files_to_export[dest_path] = file
+            # Create the operation folders here, so that the copies below do not race on them
+            os.makedirs(tmp_op_folder_path, exist_ok=True)
 
-                    if password is not None:
-                        self.import_export_encryption_handler.encrypt_data_at_export(dest_path, password)
-                        os.remove(dest_path)
+        # File copies and encryption release the GIL, so the files of a group are exported in parallel
+        if len(files_to_export) > 0:
+            with ThreadPoolExecutor(max_workers=min(self.EXPORT_WORKERS, len(files_to_export))) as executor:
+                futures = [executor.submit(self.__export_datatype_file, file, dest_path, password)
+                           for dest_path, file in files_to_export.items()]
+            for future in futures:
+                # Raise here the first error of the export, if any
+                future.result()
 
         dest_path = os.path.join(os.path.dirname(export_folder), download_file_name)
         if password is not None:
@@ -494,6 +504,14 @@ class StorageInterface:
 
         return dest_path
 
+    def __export_datatype_file(self, file, dest_path, password):
+        self.copy_file(file, dest_path)
+        self.get_storage_manager(dest_path).remove_metadata('parent_burst', check_existence=True)
+
+        if password is not None:
+            self.import_export_encryption_handler.encrypt_data_at_export(dest_path, password)
+            os.remove(dest_path)
+
     def export_datatype_from_rest_server(self, dt, data, download_file_name, public_key_path):
         password = EncryptionHandler.generate_random_password()
         dest_path = self.export_datatypes([dt], data, download_file_name, public_key_path, password)
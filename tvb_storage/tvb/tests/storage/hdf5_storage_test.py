@@ -34,6 +34,7 @@
 """
 
 import os
+import h5py
 import numpy
 import shutil
 import pytest
@@ -41,6 +42,7 @@ import pytest
 from tvb.basic.profile import TvbProfile
 from tvb.storage.h5.file.exceptions import MissingDataSetException, IncompatibleFileManagerException, \
     FileStructureException
+from tvb.storage.h5.file import hdf5_storage_manager
 from tvb.storage.h5.file.hdf5_storage_manager import HDF5StorageManager
 from tvb.storage.storage_interface import StorageInterface
 
@@ -185,6 +187,39 @@ class TestHDF5Storage(object):
         read_data = self.storage.get_data(DATASET_NAME_1, None, StorageInterface.ROOT_NODE_PATH, False, True)
         self._assert_arrays_are_equal(self.test_2D_array, read_data)
 
+    def test_append_data_with_chunks(self):
+        """
+        Test data store using append method, with chunks of a given size on the grow dimension
+        """
+        for index in range(0, self.test_2D_array.shape[-1], 2):
+            slices = (slice(None, None, 1), slice(index, index + 2, 1))
+
+            self.storage.append_data(self.test_2D_array[slices], DATASET_NAME_1, 1, False,
+                                     StorageInterface.ROOT_NODE_PATH, chunk_grow_size=2)
+
+        self.storage.close_file()
+        read_data = self.storage.get_data(DATASET_NAME_1, None, StorageInterface.ROOT_NODE_PATH, False, True)
+        self._assert_arrays_are_equal(self.test_2D_array, read_data)
+        with h5py.File(os.path.join(self.storage_folder, STORAGE_FILE_NAME), 'r') as h5_file:
+            assert h5_file[DATASET_NAME_1].chunks == (self.test_2D_array.shape[0], 2)
+
+    def test_append_data_with_chunks_bytes_bound(self, monkeypatch):
+        """
+        Test that the chunks of a given size on the grow dimension are also bounded in Bytes,
+        by halving the largest other dimension
+        """
+        monkeypatch.setattr(hdf5_storage_manager, 'MAX_CHUNK_BYTES', 4 * 125 * 8)
+        data = numpy.random.random((4, 1000, 3))
+        for index in range(data.shape[2]):
+            self.storage.append_data(data[:, :, index:index + 1], DATASET_NAME_1, 2, False,
+                                     StorageInterface.ROOT_NODE_PATH, chunk_grow_size=1)
+
+        self.storage.close_file()
+        read_data = self.storage.get_data(DATASET_NAME_1, None, StorageInterface.ROOT_NODE_PATH, False, True)
+        self._assert_arrays_are_equal(data, read_data)
+        with h5py.File(os.path.join(self.storage_folder, STORAGE_FILE_NAME), 'r') as h5_file:
+            assert h5_file[DATASET_NAME_1].chunks == (4, 125, 1)
+
     def test_append_data_on_path(self):
         """
         Test data store using append method on a given path